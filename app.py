@@ -5,16 +5,91 @@ Flask application template for the warm-up assignment
 Implements the API endpoints for cleaning and analyzing text.
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, render_template
 from starter_preprocess import TextPreprocessor
+from collections import OrderedDict
+import threading
+import logging
+import gzip
+import orjson
 import traceback
 import sys
 
 # Set up the application
+logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
 preprocessor = TextPreprocessor()
 
 
+# Bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# Default number of characters of cleaned text returned by /api/clean
+DEFAULT_PREVIEW_CHARS = 4096
+
+
+def ojsonify(obj, status=200):
+    """Return obj as a JSON response, encoded with orjson instead of jsonify"""
+    body = orjson.dumps(obj)
+    gzipped = len(body) >= GZIP_MIN_BYTES and request.accept_encodings['gzip'] > 0
+    if gzipped:
+        body = gzip.compress(body, compresslevel=6)
+
+    response = app.response_class(body, status=status,
+                                  mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def warm_up():
+    """Run the text pipeline once on a tiny input so the first request isn't slow"""
+    preprocessor.process("Warm up. Text!", num_sentences=3)
+
+
+# /api/clean is idempotent per URL, so recent pipeline results are kept in
+# an LRU cache (most recently used last) shared by all request threads
+PIPELINE_CACHE_SIZE = 64
+_pipeline_cache = OrderedDict()
+_pipeline_cache_lock = threading.Lock()
+
+
+def run_clean_pipeline(url):
+    """
+    Fetch, clean, normalize and analyze the text at url, with LRU caching
+
+    Returns:
+        (normalized_text, statistics, summary); statistics and summary are
+        None when the text was cleaned down to nothing
+    """
+    with _pipeline_cache_lock:
+        if url in _pipeline_cache:
+            _pipeline_cache.move_to_end(url)
+            return _pipeline_cache[url]
+
+    raw_text = preprocessor.fetch_from_url(url)
+    app.logger.debug('working: fetch_from_url')
+
+    gutenberg_cleaned_text = preprocessor.clean_gutenberg_text(raw_text)
+    app.logger.debug('working: gutenberg_clean_text')
+
+    # Normalization, statistics and summary share one sentence split
+    processed = preprocessor.process(gutenberg_cleaned_text, num_sentences=3)
+    app.logger.debug('working: process')
+
+    normalized_text = processed["normalized_text"]
+    if normalized_text:
+        result = (normalized_text, processed["statistics"], processed["summary"])
+    else:
+        result = (normalized_text, None, None)
+    with _pipeline_cache_lock:
+        _pipeline_cache[url] = result
+        _pipeline_cache.move_to_end(url)
+        while len(_pipeline_cache) > PIPELINE_CACHE_SIZE:
+            _pipeline_cache.popitem(last=False)
+
+    return result
 
 
 @app.route('/')
@@ -26,7 +101,7 @@ def home():
 @app.route('/health')
 def health_check():
     """Simple health check endpoint"""
-    return jsonify({
+    return ojsonify({
         "status": "healthy",
         "message": "Text preprocessing service is running"
     })
@@ -38,12 +113,14 @@ def clean_text():
     API endpoint that accepts a URL, fetches text, cleans it, and returns stats.
 
     Expected JSON input:
-        {"url": "https://www.gutenberg.org/files/1342/1342-0.txt"}
+        {"url": "https://www.gutenberg.org/files/1342/1342-0.txt",
+         "preview_chars": 4096 (optional)}
 
     Returns JSON:
         {
             "success": true/false,
-            "cleaned_text": "...",
+            "cleaned_text": "..." (first preview_chars characters),
+            "cleaned_text_length": 841227 (full normalized text, incl. spaces),
             "statistics": {...},
             "summary": "...",
             "error": "..." (if applicable)
@@ -53,40 +130,35 @@ def clean_text():
         
         data = request.get_json()
         if not data or 'url' not in data:
-            return jsonify({
+            return ojsonify({
                 "success": False,
                 "error": "Missing 'url' field in JSON request."
-            }), 400
+            }, 400)
 
         url = data['url']
 
-        raw_text = preprocessor.fetch_from_url(url)
-        print('working: fetch_from_url')
-
-        gutenberg_cleaned_text = preprocessor.clean_gutenberg_text(raw_text)
-        print('working: gutenberg_clean_text')
+        preview_chars = data.get('preview_chars', DEFAULT_PREVIEW_CHARS)
+        if (isinstance(preview_chars, bool) or not isinstance(preview_chars, int)
+                or preview_chars < 0):
+            return ojsonify({
+                "success": False,
+                "error": "'preview_chars' must be a non-negative integer."
+            }, 400)
 
-
-        normalized_text = preprocessor.normalize_text(
-            gutenberg_cleaned_text, preserve_sentences=True)
-        print('working: normalized_text')
+        normalized_text, statistics, summary = run_clean_pipeline(url)
 
         if not normalized_text:
-            return jsonify({
+            return ojsonify({
                 "success": False,
                 "error": "The text was cleaned down to nothing. Check your Gutenberg URL or cleaning rules."
-            }), 400
-
-        statistics = preprocessor.get_text_statistics(normalized_text)
-        print('working: statistics')
-
-        summary = preprocessor.create_summary(normalized_text, num_sentences=3)
-        print('working: summary')
+            }, 400)
 
-        return jsonify({
+        return ojsonify({
             "success": True,
-            # We return the fully normalized text for the front-end preview
-            "cleaned_text": normalized_text,
+            # Only a preview of the normalized text; the full text is
+            # available from /api/clean/full
+            "cleaned_text": normalized_text[:preview_chars],
+            "cleaned_text_length": len(normalized_text),
             "statistics": statistics,
             "summary": summary
         })
@@ -94,10 +166,48 @@ def clean_text():
     except Exception as e:
         print(f"ERROR in /api/clean: {e}")
         traceback.print_exc()
-        return jsonify({
+        return ojsonify({
+            "success": False,
+            "error": f"Text Processing Error: {str(e)}"
+        }, 500)
+
+
+@app.route('/api/clean/full')
+def clean_text_full():
+    """
+    API endpoint that streams the full normalized text for a URL as plain text
+
+    Expected query string:
+        ?url=https://www.gutenberg.org/files/1342/1342-0.txt
+    """
+    url = request.args.get('url')
+    if not url:
+        return ojsonify({
+            "success": False,
+            "error": "Missing 'url' query parameter."
+        }, 400)
+
+    try:
+        normalized_text, _, _ = run_clean_pipeline(url)
+    except Exception as e:
+        print(f"ERROR in /api/clean/full: {e}")
+        traceback.print_exc()
+        return ojsonify({
             "success": False,
             "error": f"Text Processing Error: {str(e)}"
-        }), 500
+        }, 500)
+
+    if not normalized_text:
+        return ojsonify({
+            "success": False,
+            "error": "The text was cleaned down to nothing. Check your Gutenberg URL or cleaning rules."
+        }, 400)
+
+    def generate(chunk_size=65536):
+        for i in range(0, len(normalized_text), chunk_size):
+            yield normalized_text[i:i + chunk_size]
+
+    return Response(generate(), mimetype='text/plain')
 
 
 @app.route('/api/analyze', methods=['POST'])
@@ -119,46 +229,47 @@ def analyze_text():
         
         data = request.get_json()
         if not data or 'text' not in data:
-            return jsonify({
+            return ojsonify({
                 "success": False,
                 "error": "Missing 'text' field in request body."
-            }), 400
+            }, 400)
 
         raw_text = data['text']
 
         normalized_text = preprocessor.normalize_text(
             raw_text, preserve_sentences=True)
 
-        statistics = preprocessor.get_text_statistics(normalized_text)
+        statistics = preprocessor.get_text_statistics(
+            normalized_text, already_normalized=True)
 
-        return jsonify({
+        return ojsonify({
             "success": True,
             "statistics": statistics
         })
 
     except Exception as e:
         print(f"Error in /api/analyze: {e}", file=sys.stderr)
-        return jsonify({
+        return ojsonify({
             "success": False,
             "error": f"Processing error: {str(e)}"
-        }), 500
+        }, 500)
 
 
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
+    return ojsonify({
         "success": False,
         "error": "Endpoint not found"
-    }), 404
+    }, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
+    return ojsonify({
         "success": False,
         "error": "Internal server error"
-    }), 500
+    }, 500)
 
 
 if __name__ == '__main__':
@@ -167,10 +278,15 @@ if __name__ == '__main__':
     print("   GET  /        - Web interface")
     print("   GET  /health    - Health check")
     print("   POST /api/clean - Clean text from URL")
+    print("   GET  /api/clean/full - Full cleaned text for a URL")
     print("   POST /api/analyze - Analyze raw text")
     print()
     print("🌐 Open your browser to: http://localhost:5000")
     print("⏹️  Press Ctrl+C to stop the server")
 
+    # The debugger and reloader add per-request overhead, so they are only
+    # enabled with --dev; production deployments use gunicorn (see Procfile)
+    dev_mode = '--dev' in sys.argv[1:]
+
     # Run the app, listening on all interfaces (0.0.0.0) for Codespaces compatibility
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    app.run(debug=dev_mode, port=5000, host='0.0.0.0', threaded=True)
@@ -6,12 +6,23 @@ This is the same code you'll use in the main Shannon assignment next week.
 """
 
 import re
-import json
+import orjson
 import requests
-from typing import List, Dict, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Tuple, Iterator
 from collections import Counter
+from itertools import islice
 import string
 
+# One pooled session for all fetches, so repeated downloads reuse warm
+# TCP/TLS connections instead of handshaking on every request
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
 
 class TextPreprocessor:
     """Handles all the annoying text cleaning so you can focus on the fun stuff"""
@@ -27,6 +38,33 @@ class TextPreprocessor:
             "<<THIS ELECTRONIC VERSION"
         ]
 
+        # Precompiled patterns so each call skips the re module's cache lookup
+        self._RE_LEADING_JUNK = re.compile(r'^[\ufeff\u200b\s]+')
+        # Smart quotes and dashes are plain substring swaps; chained
+        # str.replace calls beat both re.sub and a dict-based str.translate
+        # (which does a per-character lookup on non-ASCII text)
+        self._SMART_PUNCT = (
+            ('“', '"'), ('”', '"'),
+            ('‘', "'"), ('’', "'"),
+            ('—', '-'), ('–', '-'),
+        )
+        self._RE_KEEP_SENT = re.compile(r"[^\w\s.!?'-]")
+        self._RE_STRIP_ALL = re.compile(r"(?<!\w)'(?!\w)|[^\w\s]")
+        self._RE_WS = re.compile(r'\s+')
+        self._RE_NL3 = re.compile(r'\n{3,}')
+        self._RE_SP2 = re.compile(r' {2,}')
+        self._RE_SENT = re.compile(r'[.!?]+')
+        self._RE_SENT_END = re.compile(r'[.!?]')
+        self._RE_WORD = re.compile(r"[\w'-]+")
+
+        # ASCII-mode twins of the normalization patterns, used when the text
+        # is pure ASCII to skip Unicode property lookups. \x1c-\x1f are added
+        # because Unicode \s matches them but ASCII \s does not.
+        self._RE_KEEP_SENT_A = re.compile(r"[^\w\s\x1c-\x1f.!?'-]", re.ASCII)
+        self._RE_STRIP_ALL_A = re.compile(
+            r"(?<!\w)'(?!\w)|[^\w\s\x1c-\x1f]", re.ASCII)
+        self._RE_WS_A = re.compile(r'[\s\x1c-\x1f]+', re.ASCII)
+
     def fetch_from_url(self, url: str) -> str:
         """
         Fetch text content from a URL (especially Project Gutenberg)
@@ -46,16 +84,57 @@ class TextPreprocessor:
                 "URL must point to a .txt file (Project Gutenberg format expected).")
 
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()  
-            return response.text
+            # Stream the body and decode once with the declared charset,
+            # skipping requests' charset detection on large files
+            with _SESSION.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                buf = bytearray()
+                for chunk in response.iter_content(chunk_size=65536):
+                    buf.extend(chunk)
+                encoding = response.encoding or 'utf-8'
+            try:
+                return buf.decode(encoding, errors='replace')
+            except LookupError:
+                return buf.decode('utf-8', errors='replace')
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to fetch content from URL: {e}")
 
-    def get_text_statistics(self, text: str) -> Dict:
+    def process(self, text: str, num_sentences: int = 3) -> Dict:
+        """
+        Run the whole analysis pipeline, normalizing and splitting sentences once
+
+        Prefer this over calling get_text_statistics and create_summary
+        separately, which each redo the normalization and sentence split.
+
+        Args:
+            text: Cleaned text
+            num_sentences: Number of sentences to include in the summary
+
+        Returns dictionary with:
+            - normalized_text (normalize_text with preserve_sentences=True)
+            - sentences (tokenize_sentences of normalized_text)
+            - statistics (same as get_text_statistics)
+            - summary (same as create_summary)
+        """
+        normalized_text = self.normalize_text(text, preserve_sentences=True)
+        sentences = self.tokenize_sentences(normalized_text)
+
+        return {
+            "normalized_text": normalized_text,
+            "sentences": sentences,
+            "statistics": self._statistics_from_sentences(normalized_text, sentences),
+            "summary": self._summary_from_sentences(sentences, num_sentences)
+        }
+
+    def get_text_statistics(self, text: str, already_normalized: bool = False) -> Dict:
         """
         Calculate basic statistics about the text
 
+        Args:
+            text: Input text
+            already_normalized: If True, text is assumed to be the output of
+                normalize_text(preserve_sentences=True) and is not re-normalized
+
         Returns dictionary with:
             - total_characters
             - total_words 
@@ -64,34 +143,42 @@ class TextPreprocessor:
             - avg_sentence_length
             - most_common_words (top 10)
         """
-
-        normalized_words_text = self.normalize_text(
-            text, preserve_sentences=False)
-        words = self.tokenize_words(normalized_words_text)
-
-        chars = self.tokenize_chars(normalized_words_text, include_space=False)
-
-        normalized_sentences_text = self.normalize_text(
-            text, preserve_sentences=True)
-        sentences = self.tokenize_sentences(normalized_sentences_text)
+        if not already_normalized:
+            text = self.normalize_text(text, preserve_sentences=True)
+
+        return self._statistics_from_sentences(text, self.tokenize_sentences(text))
+
+    def _statistics_from_sentences(self, normalized_sentences_text: str, sentences: List[str]) -> Dict:
+        """Statistics for sentence-normalized text and its tokenize_sentences result"""
+        # Sentences contain no terminators, so splitting on whitespace is
+        # the same as tokenize_words on each one
+        sentence_lengths = [len(sent.split()) for sent in sentences]
+
+        # The sentence-preserving form is already lowercased with smart
+        # punctuation replaced, so only the remaining punctuation needs
+        # stripping for the word form
+        normalized_words_text = self._RE_STRIP_ALL.sub(
+            ' ', normalized_sentences_text)
+        normalized_words_text = self._RE_WS.sub(
+            ' ', normalized_words_text).strip()
+
+        # Count words straight from the stream, without materializing the
+        # word list; totals are then summed over the (much smaller) vocabulary
+        word_counts = Counter(self._word_stream(normalized_words_text))
+        total_words = sum(word_counts.values())
+        total_word_length = sum(len(w) * c for w, c in word_counts.items())
 
         # Calculate Counts
-        total_characters = len(chars)
-        total_words = len(words)
+        total_characters = self.count_chars(
+            normalized_words_text, include_space=False)
         total_sentences = len(sentences)
 
         # Calculate Averages
-        # calculate total word length for average word length
-        total_word_length = sum(len(w) for w in words)
-        # Calculate sentence lengths in words
-        sentence_lengths = self.get_sentence_lengths(sentences)
-
         avg_word_length = (total_word_length /
                            total_words) if total_words > 0 else 0
         avg_sentence_length = (sum(sentence_lengths) /
                                total_sentences) if total_sentences > 0 else 0
 
-        word_counts = Counter(words)
         most_common_words = word_counts.most_common(10)
 
         statistics = {
@@ -120,6 +207,10 @@ class TextPreprocessor:
 
         sentences = self.tokenize_sentences(normalized_text)
 
+        return self._summary_from_sentences(sentences, num_sentences)
+
+    def _summary_from_sentences(self, sentences: List[str], num_sentences: int) -> str:
+        """Join the first N sentences into a capitalized summary string"""
         summary_sentences = sentences[:num_sentences]
 
 
@@ -142,35 +233,44 @@ class TextPreprocessor:
         Removes leading non-printable characters (like BOM or zero-width spaces)
         that can cause issues with decoding or regex matching at the start of a file.
         """
-        return re.sub(r'^[\ufeff\u200b\s]+', '', text)
+        return self._RE_LEADING_JUNK.sub('', text)
 
     def clean_gutenberg_text(self, raw_text: str) -> str:
         """Remove Project Gutenberg headers/footers"""
 
         raw_text = self._remove_leading_junk(raw_text)
 
-        lines = raw_text.split('\n')
+        markers = self.gutenberg_markers[:4]
+        start_markers = [m for m in markers if "START" in m]
+        end_markers = [m for m in markers if "END" in m]
 
-        start_idx = 0
-        end_idx = len(lines)
-
-        for i, line in enumerate(lines):
-            if any(marker in line for marker in self.gutenberg_markers[:4]):
-                if "START" in line:
-                    start_idx = i + 1
-                elif "END" in line:
-                    end_idx = i
-                    break
-
-        # Join the cleaned lines
-        cleaned = '\n'.join(lines[start_idx:end_idx])
+        start, end = self._gutenberg_bounds(raw_text, start_markers, end_markers)
+        cleaned = raw_text[start:end]
 
         # Remove excessive whitespace
-        cleaned = re.sub(r'\n{3,}', '\n\n', cleaned)
-        cleaned = re.sub(r' {2,}', ' ', cleaned)
+        cleaned = self._RE_NL3.sub('\n\n', cleaned)
+        cleaned = self._RE_SP2.sub(' ', cleaned)
 
         return cleaned.strip()
 
+    def _gutenberg_bounds(self, raw_text: str, start_markers: List[str],
+                          end_markers: List[str]) -> Tuple[int, int]:
+        """(start, end) of the text between the START and END marker lines"""
+        # The body ends at the start of the line holding the first END marker
+        end_positions = [pos for pos in (raw_text.find(m) for m in end_markers)
+                         if pos >= 0]
+        end = raw_text.rfind('\n', 0, min(end_positions)) + 1 if end_positions else len(raw_text)
+
+        # ...and begins after the line holding the last START marker before it
+        start = 0
+        start_positions = [pos for pos in (raw_text.rfind(m, 0, end) for m in start_markers)
+                           if pos >= 0]
+        if start_positions:
+            line_end = raw_text.find('\n', max(start_positions))
+            start = line_end + 1 if line_end >= 0 else len(raw_text)
+
+        return start, end
+
     def normalize_text(self, text: str, preserve_sentences: bool = True) -> str:
         """
         Normalize text while preserving sentence boundaries
@@ -183,25 +283,33 @@ class TextPreprocessor:
         text = text.lower()
 
 
-        text = re.sub(r'[“”]', '"', text)
-        text = re.sub(r'[‘’]', "'", text)
-        text = re.sub(r'—|–', '-', text)
+        for old, new in self._SMART_PUNCT:
+            text = text.replace(old, new)
+
+        # Most Gutenberg text is plain ASCII by now, which the regex engine
+        # matches faster in ASCII mode
+        if text.isascii():
+            keep_sent, strip_all, ws = (self._RE_KEEP_SENT_A,
+                                        self._RE_STRIP_ALL_A, self._RE_WS_A)
+        else:
+            keep_sent, strip_all, ws = (self._RE_KEEP_SENT,
+                                        self._RE_STRIP_ALL, self._RE_WS)
 
         if preserve_sentences:
 
-            text = re.sub(r'[^\w\s.!?\'-]', ' ', text)
+            text = keep_sent.sub(' ', text)
         else:
             # Remove all punctuation except apostrophes in contractions
-            text = re.sub(r"(?<!\w)'(?!\w)|[^\w\s]", ' ', text)
+            text = strip_all.sub(' ', text)
 
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = ws.sub(' ', text)
 
         return text.strip()
 
     def tokenize_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
-        sentences = re.split(r'[.!?]+', text)
+        sentences = self._RE_SENT.split(text)
 
         # Clean up and filter
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -211,7 +319,7 @@ class TextPreprocessor:
     def tokenize_words(self, text: str) -> List[str]:
         """Split text into words"""
         # Remove sentence endings for word tokenization
-        text_for_words = re.sub(r'[.!?]', '', text)
+        text_for_words = self._RE_SENT_END.sub('', text)
 
         # Split on whitespace and filter empty strings
         words = text_for_words.split()
@@ -219,15 +327,25 @@ class TextPreprocessor:
 
         return words
 
+    def _word_stream(self, text: str) -> Iterator[str]:
+        """Lazily yield the words of punctuation-free normalized text"""
+        return (m.group(0) for m in self._RE_WORD.finditer(text))
+
     def tokenize_chars(self, text: str, include_space: bool = True) -> List[str]:
         """Split text into characters"""
         if include_space:
             # Replace multiple spaces with single space
-            text = re.sub(r'\s+', ' ', text)
+            text = self._RE_WS.sub(' ', text)
             return list(text)
         else:
             return [c for c in text if c != ' ']
 
+    def count_chars(self, text: str, include_space: bool = True) -> int:
+        """Count characters, equivalent to len(tokenize_chars(text, include_space))"""
+        if include_space:
+            return len(self._RE_WS.sub(' ', text))
+        return len(text) - text.count(' ')
+
     def get_sentence_lengths(self, sentences: List[str]) -> List[int]:
         """Get word count for each sentence"""
         return [len(self.tokenize_words(sent)) for sent in sentences]
@@ -255,12 +373,9 @@ class FrequencyAnalyzer:
             # Special case for unigrams (return as single strings, not tuples)
             return dict(Counter(tokens))
 
-        ngrams = []
-        for i in range(len(tokens) - n + 1):
-            ngram = tuple(tokens[i:i + n])
-            ngrams.append(ngram)
-
-        return dict(Counter(ngrams))
+        # zip over n staggered iterators yields each window tuple straight
+        # into Counter, without a slice or list per position
+        return dict(Counter(zip(*(islice(tokens, i, None) for i in range(n)))))
 
     def calculate_probabilities(self, ngram_counts: Dict, smoothing: float = 0.0) -> Dict:
         """
@@ -281,20 +396,18 @@ class FrequencyAnalyzer:
     def save_frequencies(self, frequencies: Dict, filename: str):
         """Save frequency dictionary to JSON file"""
         # Convert tuples to strings for JSON serialization
-        json_friendly = {}
-        for key, value in frequencies.items():
-            if isinstance(key, tuple):
-                json_friendly['||'.join(key)] = value
-            else:
-                json_friendly[key] = value
+        json_friendly = {('||'.join(key) if isinstance(key, tuple) else key): value
+                         for key, value in frequencies.items()}
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(json_friendly, f, indent=2, ensure_ascii=False)
+        # orjson writes compact UTF-8 bytes directly, much faster than json.dump
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(
+                json_friendly, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
 
     def load_frequencies(self, filename: str) -> Dict:
         """Load frequency dictionary from JSON file"""
-        with open(filename, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
+        with open(filename, 'rb') as f:
+            json_data = orjson.loads(f.read())
 
         # Convert string keys back to tuples where needed
         frequencies = {}
@@ -30,7 +30,8 @@ def check_required_packages():
         'requests', 
         'bs4',  # beautifulsoup4 imports as bs4
         'nltk',
-        'dotenv'  # python-dotenv imports as dotenv
+        'dotenv',  # python-dotenv imports as dotenv
+        'orjson'
     ]
     
     print("\n📦 Checking required packages...")
@@ -0,0 +1,14 @@
+"""
+wsgi.py
+WSGI entry point for running the service under a production server
+
+    gunicorn --preload -w 4 -k gthread --threads 2 -b 0.0.0.0:5000 wsgi:app
+
+With --preload this module is imported once in the gunicorn master, so the
+preprocessor and its compiled patterns are built and warmed up before the
+workers are forked and inherit them.
+"""
+
+from app import app, warm_up
+
+warm_up()